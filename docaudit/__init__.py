@@ -13,26 +13,31 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .angular import AngularFiles
 from .config import get_config
-from .endpoints import query, sources
-from .ml.pipelines import get_indexing_pipeline, get_querying_pipeline
 from .utils import to_abs_path
 
 
 def get_app(lifespan=None) -> FastAPI:
+    # Import the routers lazily, as the endpoints pull in the ML stack, which should
+    # only be loaded when the app is actually created
+    from .endpoints import query, sources
+
     config = get_config().fastapi
     app = FastAPI(
         title="DocAudit API",
         docs_url=config.docs_url,
         redoc_url=config.redoc_url,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.include_router(sources.router, prefix="/api")
@@ -50,31 +55,27 @@ def get_app(lifespan=None) -> FastAPI:
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    from .ml.pipelines import warm_up_pipelines
+
     # Startup logic
-    # Warm up pipelines that use an embedder to speed up the first request
-    get_indexing_pipeline()
-    get_querying_pipeline()
+    # Warm up pipelines that use an embedder to speed up the first request. Both
+    # embedders share the same model, so the pipelines are warmed up one after the
+    # other to not load the model twice.
+    await asyncio.to_thread(warm_up_pipelines)
     yield
     # Shutdown logic
 
 
-app = get_app(lifespan)
+def __getattr__(name: str):
+    # Create the app on first access (e.g. by uvicorn loading "docaudit:app"), so
+    # that importing docaudit neither parses the config nor loads the ML stack
+    if name == "app":
+        global app
+        app = get_app(lifespan)
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def serve():
     config = get_config().uvicorn
-    uvicorn.run(
-        "docaudit:app",
-        host=config.host,
-        port=config.port,
-        reload=config.reload,
-        log_level=config.log_level,
-        log_config=config.log_config,
-        ssl_keyfile=config.ssl_keyfile,
-        ssl_certfile=config.ssl_certfile,
-        ssl_keyfile_password=config.ssl_keyfile_password,
-        ssl_version=config.ssl_version,
-        ssl_cert_reqs=config.ssl_cert_reqs,
-        ssl_ca_certs=config.ssl_ca_certs,
-        ssl_ciphers=config.ssl_ciphers,
-    )
+    uvicorn.run("docaudit:app", **config.to_uvicorn_kwargs())
@@ -14,7 +14,32 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import posixpath
+import re
+
 from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+# Matches the content hashes Angular adds to the file names of its build output,
+# e.g. "main.0123456789abcdef.js" (webpack) or "main-ABCDEFGH.js" (esbuild)
+HASHED_FILENAME_PATTERN = re.compile(r"[.-]([0-9a-f]{16,}|[0-9A-Z]{8})\.\w+$")
+
+
+def is_hashed_build_file(path: str) -> bool:
+    """
+    Checks if a path relative to the Angular build directory points to a file with a
+    content hash in its name. Only scripts and styles at the top level and files in
+    media/ are considered, as files under assets/ are copied verbatim and their names
+    may only look like hashes.
+    """
+    directory, filename = posixpath.split(path)
+    if directory == "":
+        if not filename.endswith((".js", ".css")):
+            return False
+    elif directory != "media":
+        return False
+    return HASHED_FILENAME_PATTERN.search(filename) is not None
 
 
 class AngularFiles(StaticFiles):
@@ -29,3 +54,22 @@ class AngularFiles(StaticFiles):
             return super().lookup_path("index.html")
         else:
             return full_path, stat_result
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """
+        Allows clients to cache hashed files of the Angular build indefinitely.
+
+        Files without a hash in their name, like index.html, keep the default headers
+        so that clients pick up new builds.
+        """
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        if is_hashed_build_file(path):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from copy import deepcopy
 from functools import lru_cache
 import yaml
 import ssl
@@ -23,7 +24,8 @@ from .utils import to_abs_path
 
 class HaystackConfig(BaseModel):
     embedding_model: str = "gbert-large-paraphrase-cosine"
-    batch_size: int = 32  # Number of Haystack Documents to process in Pipelines at once
+    batch_size: int = 32  # Number of Haystack Documents to embed at once
+    duplicate_check_batch_size: int = 256  # Number of Documents to look up at once
 
 
 class QdrantConfig(BaseModel):
@@ -45,6 +47,8 @@ class UvicornConfig(BaseModel):
     host: str = "0.0.0.0"
     port: int = 8000
     reload: bool = False
+    loop: str = "auto"  # Uses uvloop if installed
+    http: str = "auto"  # Uses httptools if installed
     log_level: str = "error"
     log_filename: str | None = None
     ssl_keyfile: str | None = None
@@ -60,7 +64,8 @@ class UvicornConfig(BaseModel):
         if not self.log_filename:
             return LOGGING_CONFIG
 
-        custom_logging_config = LOGGING_CONFIG.copy()
+        # Deep copy to not modify the nested dicts of uvicorn's default config
+        custom_logging_config = deepcopy(LOGGING_CONFIG)
         custom_logging_config["formatters"]["default"]["use_colors"] = False
         custom_logging_config["formatters"]["access"]["use_colors"] = False
         custom_logging_config["handlers"] = {
@@ -81,6 +86,14 @@ class UvicornConfig(BaseModel):
         }
         return custom_logging_config
 
+    def to_uvicorn_kwargs(self) -> dict:
+        """
+        Returns the keyword arguments to pass to uvicorn.run().
+        """
+        return self.model_dump(exclude={"log_filename"}) | {
+            "log_config": self.log_config
+        }
+
 
 class Config(BaseModel):
     qdrant: QdrantConfig = QdrantConfig()
@@ -95,5 +108,7 @@ CONFIG_FILENAME = "config.yml"
 @lru_cache()
 def get_config() -> Config:
     with open(to_abs_path(CONFIG_FILENAME), "r") as config_file:
-        config_data = yaml.safe_load(config_file)
+        # Prefer the C implementation of the safe loader if PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        config_data = yaml.load(config_file, Loader=loader)
     return Config.model_validate(config_data)
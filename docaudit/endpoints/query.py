@@ -38,14 +38,14 @@ class Result(BaseModel):
     def from_haystack_document(
         cls,
         haystack_document: haystack.Document,
-        queried_source_ids: list[str] | None = None,
+        queried_source_ids: frozenset[str] | None = None,
     ) -> "Result":
         """
         Convert a Haystack Document to a Result object.
 
         Args:
             haystack_document: Document from Haystack
-            queried_source_ids: List of source IDs queried so that only locations for
+            queried_source_ids: Set of source IDs queried so that only locations for
             those sources are included in the result.
         """
         locations = [
@@ -74,7 +74,8 @@ def run_query(
         top_k: The number of results to return.
         source_ids: The IDs of the sources to query
     """
+    queried_source_ids = frozenset(source_ids)
     return [
-        Result.from_haystack_document(document, source_ids)
+        Result.from_haystack_document(document, queried_source_ids)
         for document in run_query_pipeline(content, top_k, source_ids) or []
     ]
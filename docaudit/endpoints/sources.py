@@ -13,12 +13,14 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import os
+import logging
 import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any
+from typing import Any, Callable
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
 from ..ml.components import new_source_id
@@ -28,10 +30,36 @@ from ..ml.pipelines import (
     run_deindexing_pipeline,
     run_indexing_pipeline,
 )
-from .temp_file import copy_upload_to_temp_file, copy_uploads_to_temp_files
+from .temp_file import (
+    copy_upload_to_temp_file,
+    copy_uploads_to_temp_files,
+    remove_temp_file,
+    to_source,
+)
 
+logger = logging.getLogger(__name__)
 router = APIRouter(tags=["sources"])
-qdrant_lock = threading.Lock()
+
+# Indexing and deindexing modify documents shared between sources, so they run one
+# after the other in a dedicated thread. Jobs waiting for their turn do not block
+# threads of FastAPI's threadpool this way.
+qdrant_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qdrant")
+
+# Seconds for which the result of looking up a source in Qdrant is cached
+INDEXED_CACHE_TTL = 2.0
+
+
+def log_exception(future: Future) -> None:
+    exception = future.exception()
+    if exception is not None:
+        logger.error("Background job failed", exc_info=exception)
+
+
+def run_in_qdrant_thread(fn: Callable, *args, **kwargs) -> None:
+    """
+    Schedules a job that modifies the Qdrant collection and logs if it fails.
+    """
+    qdrant_executor.submit(fn, *args, **kwargs).add_done_callback(log_exception)
 
 
 class SourceStatus(BaseModel):
@@ -51,27 +79,107 @@ class SourceStatusBroker:
     NOT_FOUND = "not found"
 
     def __init__(self):
+        # Only writes acquire the lock, as set_aborted and set_indexing must check
+        # and update a status in one step. Reading a single key from a dict is
+        # atomic, so reads go without it.
         self.source_id_to_status_lock = threading.Lock()
         self.source_id_to_status: dict[str, str] = {}
 
+        # Clients poll the statusses of their sources, so the results of looking up
+        # sources in Qdrant are cached for a short time. Evicting a source bumps its
+        # generation, so that lookups started before cannot cache a stale result.
+        # Generations are only needed while lookups are running.
+        self.indexed_cache_lock = threading.Lock()
+        self.indexed_cache: dict[str, tuple[float, bool]] = {}
+        self.indexed_cache_generations: dict[str, int] = {}
+        self.indexed_lookups_running = 0
+
+    def lookup_indexed(
+        self,
+        source_ids: list[str],
+        lookup: Callable[[list[str]], dict[str, bool]],
+    ) -> dict[str, bool]:
+        """
+        Returns whether the sources are indexed, using the cache where possible and
+        the lookup function for the rest.
+        """
+        now = time.monotonic()
+        indexed = {}
+        missing_source_ids = []
+        for source_id in source_ids:
+            entry = self.indexed_cache.get(source_id, None)
+            if entry is not None and entry[0] > now:
+                indexed[source_id] = entry[1]
+            else:
+                missing_source_ids.append(source_id)
+        if not missing_source_ids:
+            return indexed
+
+        with self.indexed_cache_lock:
+            self.indexed_lookups_running += 1
+            generations = {
+                source_id: self.indexed_cache_generations.get(source_id, 0)
+                for source_id in missing_source_ids
+            }
+
+        looked_up = {}
+        try:
+            looked_up = lookup(missing_source_ids)
+        finally:
+            self.cache_indexed(looked_up, generations)
+        indexed.update(looked_up)
+        return indexed
+
+    def cache_indexed(self, indexed: dict[str, bool], generations: dict[str, int]):
+        now = time.monotonic()
+        expires_at = now + INDEXED_CACHE_TTL
+        with self.indexed_cache_lock:
+            # Drop expired entries so that the cache does not grow without bound
+            expired_source_ids = [
+                source_id
+                for source_id, (entry_expires_at, _) in self.indexed_cache.items()
+                if entry_expires_at <= now
+            ]
+            for source_id in expired_source_ids:
+                del self.indexed_cache[source_id]
+
+            # Skip results of sources evicted while they were looked up
+            for source_id, is_indexed_ in indexed.items():
+                generation = self.indexed_cache_generations.get(source_id, 0)
+                if generation == generations[source_id]:
+                    self.indexed_cache[source_id] = (expires_at, is_indexed_)
+
+            self.indexed_lookups_running -= 1
+            if self.indexed_lookups_running == 0:
+                self.indexed_cache_generations.clear()
+
+    def uncache_indexed(self, source_id: str):
+        with self.indexed_cache_lock:
+            self.indexed_cache.pop(source_id, None)
+            if self.indexed_lookups_running:
+                generation = self.indexed_cache_generations.get(source_id, 0)
+                self.indexed_cache_generations[source_id] = generation + 1
+
     def get_status(self, source_id: str) -> str:
-        with self.source_id_to_status_lock:
-            status = self.source_id_to_status.get(source_id, None)
+        status = self.source_id_to_status.get(source_id, None)
         if status is None:
-            status = self.INDEXED if is_indexed(source_id) else self.NOT_FOUND
+            indexed = self.lookup_indexed(
+                [source_id], lambda source_ids: {source_id: is_indexed(source_id)}
+            )
+            status = self.INDEXED if indexed[source_id] else self.NOT_FOUND
         return status
 
     def get_statusses(self, source_ids: list[str]) -> dict[str, str]:
-        with self.source_id_to_status_lock:
-            statusses = {
-                source_id: self.source_id_to_status.get(source_id, None)
-                for source_id in source_ids
-            }
-        missing_source_ids = [
-            source_id for source_id, status in statusses.items() if status is None
-        ]
-        for source_id, is_indexed in are_indexed(missing_source_ids).items():
-            statusses[source_id] = self.INDEXED if is_indexed else self.NOT_FOUND
+        statusses = {
+            source_id: self.source_id_to_status.get(source_id, None)
+            for source_id in source_ids
+        }
+        indexed = self.lookup_indexed(
+            [source_id for source_id, status in statusses.items() if status is None],
+            are_indexed,
+        )
+        for source_id, is_indexed_ in indexed.items():
+            statusses[source_id] = self.INDEXED if is_indexed_ else self.NOT_FOUND
         return statusses
 
     def is_(self, source_id: str, status: str) -> bool:
@@ -95,10 +203,8 @@ class SourceStatusBroker:
 
     def set_completed(self, source_id: str):
         with self.source_id_to_status_lock:
-            try:
-                del self.source_id_to_status[source_id]
-            except KeyError:
-                pass
+            self.source_id_to_status.pop(source_id, None)
+        self.uncache_indexed(source_id)
 
 
 @lru_cache
@@ -108,12 +214,10 @@ def get_source_status_broker() -> SourceStatusBroker:
 
 @router.post("/sources/single", status_code=201, response_model=SourceStatus)
 def index_source(
-    background_tasks: BackgroundTasks,
     temp_file: Any = Depends(copy_upload_to_temp_file),
     source_status_broker: SourceStatusBroker = Depends(get_source_status_broker),
 ) -> SourceStatus:
     for source_status in index_sources(
-        background_tasks=background_tasks,
         temp_files=[temp_file],
         source_status_broker=source_status_broker,
     ):
@@ -123,30 +227,28 @@ def index_source(
 
 @router.post("/sources", status_code=201, response_model=list[SourceStatus])
 def index_sources(
-    background_tasks: BackgroundTasks,
     temp_files: list[Any] = Depends(copy_uploads_to_temp_files),
     source_status_broker: SourceStatusBroker = Depends(get_source_status_broker),
 ):
-    def index_in_background(temp_files: list[Any], source_ids: list[str]):
-        for temp_file, source_id in zip(temp_files, source_ids):
-            # Use the pipeline with one source at a time to give other processes a
-            # chance to aquire the lock.
-            qdrant_lock.acquire()
-            try:
-                if source_status_broker.is_(source_id, source_status_broker.ABORTED):
-                    continue
-                source_status_broker.set_indexing(source_id)
-                run_indexing_pipeline(sources=[temp_file.name], source_ids=[source_id])
-
-            finally:
-                source_status_broker.set_completed(source_id)
-                qdrant_lock.release()
-                os.remove(temp_file.name)
-
-    source_ids = [new_source_id() for _ in temp_files]
-    background_tasks.add_task(index_in_background, temp_files, source_ids)
-    for source_id in source_ids:
+    def index_in_background(temp_file: Any, source_id: str):
+        try:
+            if source_status_broker.is_(source_id, source_status_broker.ABORTED):
+                return
+            source_status_broker.set_indexing(source_id)
+            run_indexing_pipeline(
+                sources=[to_source(temp_file)], source_ids=[source_id]
+            )
+
+        finally:
+            source_status_broker.set_completed(source_id)
+            remove_temp_file(temp_file)
+
+    for temp_file in temp_files:
+        source_id = new_source_id()
+        # Set the status before scheduling, as indexing only starts from "waiting".
+        # Use one job per source so that a failing source does not stop the others.
         source_status_broker.set_waiting(source_id)
+        run_in_qdrant_thread(index_in_background, temp_file, source_id)
         yield SourceStatus(id=source_id, status=source_status_broker.WAITING)
 
 
@@ -171,12 +273,10 @@ def get_source_statusses(
 
 @router.delete("/sources/{source_id}", status_code=204)
 def deindex_source(
-    background_tasks: BackgroundTasks,
     source_id: str,
     source_status_broker: SourceStatusBroker = Depends(get_source_status_broker),
 ) -> None:
     return deindex_sources(
-        background_tasks=background_tasks,
         source_ids=[source_id],
         source_status_broker=source_status_broker,
     )
@@ -184,22 +284,20 @@ def deindex_source(
 
 @router.delete("/sources", status_code=204)
 def deindex_sources(
-    background_tasks: BackgroundTasks,
     source_ids: list[str] = Query(...),
     source_status_broker: SourceStatusBroker = Depends(get_source_status_broker),
 ) -> None:
-    def deindex_in_background(source_ids: list[str]):
-        qdrant_lock.acquire()
-        try:
-            run_deindexing_pipeline(source_ids=source_ids)
-        finally:
-            qdrant_lock.release()
-
-    ids_to_deindex = set()
+    ids_to_deindex = []  # Source IDs are unique, as they are keys of a dict
     for source_id, status in source_status_broker.get_statusses(source_ids).items():
         if status == source_status_broker.INDEXED:
-            ids_to_deindex.add(source_id)
+            ids_to_deindex.append(source_id)
         elif status == source_status_broker.WAITING:
             source_status_broker.set_aborted(source_id)
 
-    background_tasks.add_task(deindex_in_background, list(ids_to_deindex))
+    def deindex_in_background(source_ids: list[str]):
+        run_deindexing_pipeline(source_ids=source_ids)
+        for source_id in source_ids:
+            source_status_broker.uncache_indexed(source_id)
+
+    if ids_to_deindex:
+        run_in_qdrant_thread(deindex_in_background, ids_to_deindex)
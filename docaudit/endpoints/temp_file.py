@@ -13,42 +13,136 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import shutil
+import threading
+from io import BytesIO
 from tempfile import NamedTemporaryFile, _TemporaryFileWrapper
+from typing import IO
 
 from fastapi import UploadFile
 
+# Uploads up to this size are kept in memory instead of being written to disk, which
+# matches the size up to which Starlette keeps uploads in memory
+MAX_IN_MEMORY_SIZE = 1024 * 1024
 
-def copy_upload_to_temp_file(upload_file: UploadFile) -> _TemporaryFileWrapper:
+# Uploads kept in memory wait there until their indexing job runs, so the total size
+# of them is limited. Further uploads are written to disk.
+MAX_TOTAL_IN_MEMORY_SIZE = 64 * 1024 * 1024
+
+# Buffer size for copying uploads, larger than shutil's default to save syscalls
+COPY_BUFFER_SIZE = 1024 * 1024
+
+TempFile = _TemporaryFileWrapper | BytesIO
+
+in_memory_size_lock = threading.Lock()
+in_memory_size = 0
+
+
+def reserve_in_memory_size(size: int | None) -> bool:
+    """Reserves memory for an upload if it is small enough and the total allows it.
+
+    Args:
+        size (int | None): The size of the upload in bytes.
+
+    Returns:
+        bool: Whether the upload may be kept in memory.
+    """
+    global in_memory_size
+    if size is None or size > MAX_IN_MEMORY_SIZE:
+        return False
+    with in_memory_size_lock:
+        if in_memory_size + size > MAX_TOTAL_IN_MEMORY_SIZE:
+            return False
+        in_memory_size += size
+        return True
+
+
+def release_in_memory_size(size: int) -> None:
+    """Releases memory reserved using reserve_in_memory_size.
+
+    Args:
+        size (int): The size of the upload in bytes.
+    """
+    global in_memory_size
+    with in_memory_size_lock:
+        in_memory_size -= size
+
+
+def copy_upload_to_temp_file(upload_file: UploadFile) -> TempFile:
     """Copies the contents of an upload file to a temporary file.
 
-    Please note that the temporary file is not automatically deleted and must be deleted
-    manually.
+    Uploads of up to MAX_IN_MEMORY_SIZE bytes are copied to an in-memory buffer as long
+    as the buffers of all uploads stay within MAX_TOTAL_IN_MEMORY_SIZE bytes. Other
+    uploads are copied to a named temporary file on disk. Please note that the
+    temporary file is not automatically deleted and must be deleted manually using
+    remove_temp_file.
 
     Args:
         upload_file (UploadFile): The upload file to copy.
 
     Returns:
-        NamedTemporaryFile: The temporary file.
+        TempFile: The temporary file.
     """
-    temp_file = NamedTemporaryFile(delete=False)
-    shutil.copyfileobj(upload_file.file, temp_file.file)
-    temp_file.file.seek(0)  # Reset cursor after copying
+    if not reserve_in_memory_size(upload_file.size):
+        temp_file = NamedTemporaryFile(delete=False)
+        shutil.copyfileobj(upload_file.file, temp_file, COPY_BUFFER_SIZE)
+        temp_file.seek(0)  # Reset cursor after copying
+        return temp_file
+
+    temp_file = BytesIO()
+    try:
+        shutil.copyfileobj(upload_file.file, temp_file, COPY_BUFFER_SIZE)
+    except BaseException:
+        release_in_memory_size(upload_file.size)
+        raise
+    # Account for the bytes actually copied, as remove_temp_file releases those
+    release_in_memory_size(upload_file.size - temp_file.tell())
+    temp_file.seek(0)  # Reset cursor after copying
     return temp_file
 
 
 def copy_uploads_to_temp_files(
     upload_files: list[UploadFile],
-) -> list[_TemporaryFileWrapper]:
+) -> list[TempFile]:
     """Copies uploaded files to temporary files.
 
     Please note that the temporary files are not automatically deleted and must be
-    deleted manually.
+    deleted manually using remove_temp_file.
 
     Args:
         upload_files (list[UploadFile]): The upload files to copy.
 
     Returns:
-        list[_NamedTemporaryFile]: A generator of temporary files.
+        list[TempFile]: The temporary files.
     """
     return [copy_upload_to_temp_file(upload_file) for upload_file in upload_files]
+
+
+def to_source(temp_file: TempFile) -> str | IO[bytes]:
+    """Returns the temporary file as source for the indexing pipeline.
+
+    Temporary files on disk are passed by name, as Haystack deep copies the inputs of
+    a pipeline and open files cannot be copied.
+
+    Args:
+        temp_file (TempFile): The temporary file.
+
+    Returns:
+        str | IO[bytes]: The in-memory buffer or the name of the file on disk.
+    """
+    return temp_file if isinstance(temp_file, BytesIO) else temp_file.name
+
+
+def remove_temp_file(temp_file: TempFile) -> None:
+    """Closes the temporary file and deletes it from disk if necessary.
+
+    Args:
+        temp_file (TempFile): The temporary file to remove.
+    """
+    if isinstance(temp_file, BytesIO):
+        release_in_memory_size(temp_file.seek(0, os.SEEK_END))
+        temp_file.close()
+    else:
+        temp_file.close()
+        os.remove(temp_file.name)
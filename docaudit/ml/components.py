@@ -16,9 +16,11 @@
 import hashlib
 import re
 import uuid
+from collections import defaultdict
 from typing import IO, Any, Dict, Generator, List
 
 import docx
+from docx.enum.style import WD_STYLE_TYPE
 from docx.text.paragraph import Paragraph
 from haystack import Document, component, logging
 from haystack.core.component.types import Variadic
@@ -28,6 +30,8 @@ from ..utils import remove_extra_whitespace
 
 logger = logging.getLogger(__name__)
 
+HEADING_PATTERN = re.compile(r"Heading (\d+)")
+
 
 class DocxParserError(Exception):
     pass
@@ -35,13 +39,39 @@ class DocxParserError(Exception):
 
 class DocxParser:
     @staticmethod
-    def parse_level(paragraph: Paragraph) -> int | None:
+    def get_style_names(
+        document: docx.document.Document,
+    ) -> dict[str | None, str | None]:
+        """
+        Maps the IDs of the paragraph styles of a document to their names. The default
+        style is mapped to None, as paragraphs without a style ID use it.
+        """
+        style_names = {
+            style.style_id: style.name
+            for style in document.styles
+            if style.type == WD_STYLE_TYPE.PARAGRAPH
+        }
+        default_style = document.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+        style_names[None] = default_style.name if default_style is not None else None
+        return style_names
+
+    @staticmethod
+    def parse_level(
+        paragraph: Paragraph, style_names: dict[str | None, str | None] | None = None
+    ) -> int | None:
         """
         Parses the level of a heading paragraph.
         If the paragraph is not a heading, returns None.
         """
-        style = paragraph.style.name
-        match = re.search(r"Heading (\d+)", style)
+        if style_names is None:
+            style = paragraph.style.name
+        else:
+            # Looking up the style via python-docx searches the styles of the document
+            # for every paragraph, so use the style names collected in advance
+            style = style_names.get(paragraph._p.style, style_names[None])
+        if not style or "Heading" not in style:
+            return None  # Fast path, as most paragraphs are not headings
+        match = HEADING_PATTERN.search(style)
         return int(match.group(1)) if match else None
 
     @staticmethod
@@ -64,13 +94,15 @@ class DocxParser:
         headers = []
         contents = []
 
-        for paragraph in cls.open_docx_carefully(docx_input).paragraphs:
-            paragraph_level = cls.parse_level(paragraph)
+        document = cls.open_docx_carefully(docx_input)
+        style_names = cls.get_style_names(document)
+        for paragraph in document.paragraphs:
+            paragraph_level = cls.parse_level(paragraph, style_names)
             paragraph_text = remove_extra_whitespace(paragraph.text)
             if paragraph_level is not None:
                 # Paragraph is a heading, so yield the previous content if there is any
                 if headers or contents:
-                    yield tuple(headers), ("\n" * 2).join(contents)
+                    yield tuple(headers), "\n\n".join(contents)
 
                 # Update headers and reset content
                 headers = headers[: paragraph_level - 1]
@@ -82,7 +114,7 @@ class DocxParser:
 
         # Yield the last headers and content if there are any
         if headers or contents:
-            yield tuple(headers), ("\n" * 2).join(contents)
+            yield tuple(headers), "\n\n".join(contents)
 
 
 def new_source_id() -> str:
@@ -187,6 +219,20 @@ def recursively_merge_dicts(d1: Dict, d2: Dict) -> Dict:
     return merged
 
 
+def remove_duplicate_locations(locations: List[Dict]) -> List[Dict]:
+    """
+    Removes duplicate locations, keeping the first occurrence of each.
+    """
+    seen = set()
+    unique_locations = []
+    for location in locations:
+        key = (location["id"], location["type"], tuple(location["path"]))
+        if key not in seen:
+            seen.add(key)
+            unique_locations.append(location)
+    return unique_locations
+
+
 @component
 class MergeMetadata:
     """
@@ -201,10 +247,16 @@ class MergeMetadata:
         """
 
         # Create a dictionary mapping IDs to documents
-        id_to_documents: Dict[str, List[Document]] = {}
+        id_to_documents: Dict[str, List[Document]] = defaultdict(list)
+        documents_count = 0
         for documents_list in documents:
+            documents_count += len(documents_list)
             for doc in documents_list:
-                id_to_documents.setdefault(doc.id, []).append(doc)
+                id_to_documents[doc.id].append(doc)
+
+        # Nothing to merge if all IDs are unique
+        if len(id_to_documents) == documents_count:
+            return {"documents": [docs[0] for docs in id_to_documents.values()]}
 
         # Merge the metadata of documents with the same ID
         # Keep the first document and merge the metadata of the rest into it
@@ -213,6 +265,10 @@ class MergeMetadata:
             merged_doc = docs[0]
             for doc in docs[1:]:
                 merged_doc.meta = recursively_merge_dicts(merged_doc.meta, doc.meta)
+            if len(docs) > 1 and "locations" in merged_doc.meta:
+                merged_doc.meta["locations"] = remove_duplicate_locations(
+                    merged_doc.meta["locations"]
+                )
             merged_documents.append(merged_doc)
 
         return {"documents": merged_documents}
@@ -255,8 +311,9 @@ class DuplicateChecker:
             )
             retrieved.extend(existing_docs)
 
+            existing_ids = {existing_doc.id for existing_doc in existing_docs}
             for doc in batch:
-                if any(existing_doc.id == doc.id for existing_doc in existing_docs):
+                if doc.id in existing_ids:
                     hits.append(doc)
                 else:
                     misses.append(doc)
@@ -282,6 +339,7 @@ class LocationRemover:
         if source_ids is None:
             return {"documents": documents}
 
+        source_ids = frozenset(source_ids)  # For fast membership tests
         for doc in documents:
             doc.meta["locations"] = [
                 location
@@ -29,6 +29,9 @@ from haystack.document_stores.types import DuplicatePolicy
 from haystack.utils import Secret
 from haystack_integrations.components.retrievers.qdrant import QdrantEmbeddingRetriever
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
+from haystack_integrations.document_stores.qdrant.filters import (
+    convert_filters_to_qdrant,
+)
 
 from ..config import get_config
 from ..utils import to_abs_path
@@ -41,6 +44,7 @@ from .components import (
 )
 
 
+@lru_cache
 def get_document_store():
     config = get_config().qdrant
     return QdrantDocumentStore(
@@ -103,7 +107,7 @@ def get_indexing_pipeline():
     )
     duplicate_checker = DuplicateChecker(
         document_store=document_store,
-        batch_size=config.batch_size,
+        batch_size=config.duplicate_check_batch_size,
     )
     embedder = get_embedder(for_documents=True)
     writer = DocumentWriter(
@@ -177,6 +181,18 @@ def get_querying_pipeline():
     return pipeline
 
 
+def warm_up_pipelines() -> None:
+    """
+    Creates the pipelines that use an embedder and runs a dummy embedding through
+    them, so that the first request does not have to pay for lazy initializations.
+    """
+    warm_up_text = "Warm-up"
+    get_indexing_pipeline().get_component("embedder").run(
+        documents=[Document(content=warm_up_text)]
+    )
+    get_querying_pipeline().get_component("embedder").run(text=warm_up_text)
+
+
 def run_indexing_pipeline(
     sources: list[str | IO[bytes]], source_ids: list[str] | None = None
 ) -> dict[str, Any]:
@@ -198,8 +214,17 @@ def run_deindexing_pipeline(source_ids: list[str]) -> dict[str, Any]:
 def is_indexed(source_id: str) -> bool:
     filters = dict(field="meta.locations[].id", operator="==", value=source_id)
 
-    # TODO: Count documents for a more efficient check if a source is indexed
-    return bool(len(get_document_store().filter_documents(filters=filters)))
+    # Fetch at most one point without payload and vector, as only the existence of a
+    # document for the source matters
+    document_store = get_document_store()
+    records, _ = document_store.client.scroll(
+        collection_name=document_store.index,
+        scroll_filter=convert_filters_to_qdrant(filters),
+        limit=1,
+        with_payload=False,
+        with_vectors=False,
+    )
+    return bool(records)
 
 
 def are_indexed(source_ids: list[str]) -> dict[str, bool]:
@@ -14,16 +14,18 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
-from docaudit.ml.indexing import index_docx
-from docaudit.ml.querying import query
-
-index_docx(["tests/data/test.docx"], language="de")
+from docaudit.ml.pipelines import run_indexing_pipeline, run_query_pipeline
 
 if __name__ == "__main__":
+    # Index the test document only when run as a script, not on import
+    run_indexing_pipeline(["tests/data/test.docx"])
+
     while True:
-        for document in query(input("Please enter query: ")):
+        for document in run_query_pipeline(input("Please enter query: ")) or []:
             # fmt: off
-            headers = ", ".join(document.meta.get("headers", []))
+            headers = ", ".join(
+                ", ".join(location["path"]) for location in document.meta.get("locations", [])
+            )
             print(f"Headers: {headers}\nText: {document.content} (Score: {document.score})")
             print("-" * 100)
             # fmt: on
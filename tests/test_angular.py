@@ -0,0 +1,45 @@
+# Copyright (C) 2024 Helmar Hutschenreuter
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from docaudit.angular import is_hashed_build_file
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        # Build output with content hashes (webpack and esbuild)
+        ("main.0123456789abcdef.js", True),
+        ("styles.0123456789abcdef.css", True),
+        ("main-ABCDEFGH.js", True),
+        ("chunk-ABCDEFGH.js", True),
+        ("media/font-ABCDEFGH.woff2", True),
+        # Files without a hash
+        ("index.html", False),
+        ("main.js", False),
+        ("favicon.ico", False),
+        ("media/font.woff2", False),
+        # Assets are copied verbatim, even if their names look like hashes
+        ("assets/report-20240101.pdf", False),
+        ("assets/logo-V2ABCDEF.png", False),
+        ("assets/main-ABCDEFGH.js", False),
+        # Names that look like hashes, but are no scripts or styles at the top level
+        ("report-20240101.pdf", False),
+        ("logo-V2ABCDEF.png", False),
+    ],
+)
+def test_is_hashed_build_file(path, expected):
+    assert is_hashed_build_file(path) == expected
@@ -0,0 +1,119 @@
+# Copyright (C) 2024 Helmar Hutschenreuter
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from docaudit.endpoints import sources
+from docaudit.endpoints.sources import INDEXED_CACHE_TTL, SourceStatusBroker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(sources.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    # Record the source IDs looked up in Qdrant, where only "indexed" is indexed
+    lookups = []
+
+    def mock_are_indexed(source_ids):
+        lookups.append(list(source_ids))
+        return {source_id: source_id == "indexed" for source_id in source_ids}
+
+    def mock_is_indexed(source_id):
+        return mock_are_indexed([source_id])[source_id]
+
+    monkeypatch.setattr(sources, "are_indexed", mock_are_indexed)
+    monkeypatch.setattr(sources, "is_indexed", mock_is_indexed)
+    return lookups
+
+
+def test_get_statusses_caches_lookups(clock, lookups):
+    broker = SourceStatusBroker()
+    expected = {"indexed": broker.INDEXED, "missing": broker.NOT_FOUND}
+
+    assert broker.get_statusses(["indexed", "missing"]) == expected
+    assert broker.get_statusses(["indexed", "missing"]) == expected
+    assert broker.get_status("indexed") == broker.INDEXED
+    assert lookups == [["indexed", "missing"]]
+
+
+def test_get_statusses_looks_up_uncached_sources_only(clock, lookups):
+    broker = SourceStatusBroker()
+    broker.get_statusses(["indexed"])
+    broker.get_statusses(["indexed", "missing"])
+
+    assert lookups == [["indexed"], ["missing"]]
+
+
+def test_cached_lookups_expire(clock, lookups):
+    broker = SourceStatusBroker()
+    broker.get_status("indexed")
+    clock[0] += INDEXED_CACHE_TTL
+    broker.get_status("indexed")
+
+    assert lookups == [["indexed"], ["indexed"]]
+
+
+def test_expired_lookups_are_pruned(clock, lookups):
+    broker = SourceStatusBroker()
+    broker.get_status("indexed")
+    clock[0] += INDEXED_CACHE_TTL
+    broker.get_status("missing")
+
+    assert list(broker.indexed_cache) == ["missing"]
+
+
+def test_set_completed_evicts_cached_lookup(clock, lookups):
+    broker = SourceStatusBroker()
+    broker.get_status("indexed")
+    broker.set_waiting("indexed")
+    broker.set_completed("indexed")
+    broker.get_status("indexed")
+
+    assert lookups == [["indexed"], ["indexed"]]
+
+
+def test_lookup_evicted_while_running_is_not_cached(clock, monkeypatch):
+    broker = SourceStatusBroker()
+
+    def mock_are_indexed(source_ids):
+        # The source is evicted (e.g. by a deindexing job) during the lookup
+        broker.uncache_indexed("indexed")
+        return {source_id: True for source_id in source_ids}
+
+    monkeypatch.setattr(sources, "are_indexed", mock_are_indexed)
+
+    assert broker.get_statusses(["indexed"]) == {"indexed": broker.INDEXED}
+    assert broker.indexed_cache == {}
+    assert broker.indexed_cache_generations == {}
+    assert broker.indexed_lookups_running == 0
+
+
+def test_failed_lookup_is_not_counted_as_running(clock, monkeypatch):
+    broker = SourceStatusBroker()
+
+    def mock_are_indexed(source_ids):
+        raise ConnectionError("Qdrant is not available")
+
+    monkeypatch.setattr(sources, "are_indexed", mock_are_indexed)
+
+    with pytest.raises(ConnectionError):
+        broker.get_statusses(["indexed"])
+    assert broker.indexed_cache == {}
+    assert broker.indexed_lookups_running == 0
@@ -15,10 +15,12 @@
 
 import docx
 import pytest
+from haystack import Document
 
 from docaudit.ml.components import (
     DocxParser,
     DocxParserError,
+    MergeMetadata,
     iter_sources,
     recursively_merge_dicts,
 )
@@ -45,9 +47,18 @@ def test_parse_levels(levels):
         else:
             doc.add_heading(f"Heading {level}", level)
 
-    # Parse the document and check if the levels are correct
-    for paragraph, level in zip(doc.paragraphs, levels):
+    # Add a paragraph with the default style and one with an unknown style ID, both of
+    # which python-docx resolves to the default style
+    doc.add_paragraph("Default style")
+    doc.add_paragraph("Unknown style")._p.style = "UnknownStyle"
+    levels = [*levels, None, None]
+
+    # Parse the document and check if the levels are correct, both with and without
+    # the style names collected in advance
+    style_names = DocxParser.get_style_names(doc)
+    for paragraph, level in zip(doc.paragraphs, levels, strict=True):
         assert DocxParser.parse_level(paragraph) == level
+        assert DocxParser.parse_level(paragraph, style_names) == level
 
 
 def test_open_docx_carefully_success(monkeypatch):
@@ -203,3 +214,42 @@ def test_iter_sources(monkeypatch, sources, source_ids, expected):
 )
 def test_recursively_merge_dicts(d1, d2, expected):
     assert recursively_merge_dicts(d1, d2) == expected
+
+
+@pytest.mark.parametrize(
+    "ids,expected_ids",
+    [
+        # Unique IDs are passed through
+        (["a", "b"], ["a", "b"]),
+        # Documents with the same ID are merged into the first one
+        (["a", "b", "a"], ["a", "b"]),
+    ],
+)
+def test_merge_metadata(ids, expected_ids):
+    documents = [
+        Document(id=doc_id, meta={"locations": [{"id": i, "type": "docx", "path": []}]})
+        for i, doc_id in enumerate(ids)
+    ]
+    merged = MergeMetadata().run([documents[:1], documents[1:]])["documents"]
+
+    assert [doc.id for doc in merged] == expected_ids
+    assert [location["id"] for location in merged[0].meta["locations"]] == [
+        i for i, doc_id in enumerate(ids) if doc_id == "a"
+    ]
+
+
+@pytest.mark.parametrize(
+    "paths",
+    [
+        (("Heading",), ("Heading",)),
+        # Paths of stored documents come back from Qdrant as lists
+        (["Heading"], ("Heading",)),
+        (("Heading",), ["Heading"]),
+    ],
+)
+def test_merge_metadata_removes_duplicate_locations(paths):
+    locations = [{"id": "source", "type": "docx", "path": path} for path in paths]
+    documents = [Document(id="a", meta={"locations": [loc]}) for loc in locations]
+    merged = MergeMetadata().run([documents[:1], documents[1:]])["documents"]
+
+    assert merged[0].meta["locations"] == locations[:1]